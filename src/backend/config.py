@@ -27,4 +27,12 @@ TOP_K = 5
 
 ENABLE_MODERATION = True
 MAX_QUERY_LEN = 500
-RATE_LIMIT_PER_MIN = 30
\ No newline at end of file
+RATE_LIMIT_PER_MIN = 30
+
+ADAPTIVE_MODE = os.getenv("ADAPTIVE_MODE", "true").lower() in ("1", "true", "yes")
+ADAPTIVE_MAX_DISTANCE = float(os.getenv("ADAPTIVE_MAX_DISTANCE", "0.45"))
+ADAPTIVE_MIN_MARGIN = float(os.getenv("ADAPTIVE_MIN_MARGIN", "0.08"))
+
+SIMILAR_GRAPH = CHROMA_DIR / "similar_graph.json"
+SIMILAR_K = int(os.getenv("SIMILAR_K", "5"))
+SIMILAR_BATCH = int(os.getenv("SIMILAR_BATCH", "256"))
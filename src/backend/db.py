@@ -3,6 +3,7 @@ import json
 from chromadb.api import ClientAPI
 from chromadb import PersistentClient
 from chromadb.utils import embedding_functions
+from .similarity import build_similarity_graph, record_fingerprint
 from .config import CHROMA_DIR, BOOKS_JSON, COLLECTION_NAME, OPENAI_API_KEY, EMBED_MODEL
 
 def get_client() -> ClientAPI:
@@ -46,8 +47,21 @@ def index_books():
     ids, docs, metas = [], [], []
     for i, r in enumerate(books):
         _id, doc, meta = _normalize_record(i, r)
+        meta["fingerprint"] = record_fingerprint(doc, meta)
         ids.append(_id); docs.append(doc); metas.append(meta)
-    coll.upsert(ids=ids, documents=docs, metadatas=metas)
+    existing = coll.get(ids=ids, include=["metadatas"]) if ids else {"ids": [], "metadatas": []}
+    stored = {
+        _id: (md or {}).get("fingerprint")
+        for _id, md in zip(existing["ids"], existing["metadatas"])
+    }
+    changed = [n for n, _id in enumerate(ids) if stored.get(_id) != metas[n]["fingerprint"]]
+    if changed:
+        coll.upsert(
+            ids=[ids[n] for n in changed],
+            documents=[docs[n] for n in changed],
+            metadatas=[metas[n] for n in changed],
+        )
+    build_similarity_graph(coll)
     return len(books)
 
 def _to_primitive(v):
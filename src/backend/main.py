@@ -1,10 +1,11 @@
-from fastapi import FastAPI, HTTPException, Request, UploadFile, File
+from fastapi import FastAPI, HTTPException, Request, UploadFile, File, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response, FileResponse
 from pydantic import BaseModel
 from typing import Optional
 from .db import index_books
 from .rag_pipeline import RAGPipeline
+from .similarity import SimilarityIndex
 from .tools import get_summary_by_title
 from .safety import moderate_query
 from .rate_limit import RateLimiter
@@ -28,6 +29,7 @@ from starlette.middleware.gzip import GZipMiddleware
 
 app = FastAPI(title="Smart Librarian API")
 pipeline: Optional[RAGPipeline] = None
+similar_index = SimilarityIndex()
 limiter = RateLimiter(limit=RATE_LIMIT_PER_MIN, window_s=60)
 app.add_middleware(
     CORSMiddleware,
@@ -41,6 +43,7 @@ log = logging.getLogger("cover")
 
 class RecommendIn(BaseModel):
     query: str
+    include_similar: bool = False
 
 class TTSIn(BaseModel):
     text: str
@@ -54,12 +57,13 @@ class CoverIn(BaseModel):
 
 @app.on_event("startup")
 def _startup():
-    global pipeline
+    global pipeline, similar_index
     pipeline = RAGPipeline()
+    similar_index = SimilarityIndex.load()
 
 @app.get("/")
 def root():
-    return {"name": "Smart Librarian API", "endpoints": ["/health", "/docs", "/recommend", "/summary"]}
+    return {"name": "Smart Librarian API", "endpoints": ["/health", "/docs", "/recommend", "/summary", "/similar"]}
 
 @app.get("/health")
 def health():
@@ -67,9 +71,19 @@ def health():
 
 @app.post("/admin/reindex")
 def admin_reindex():
+    global similar_index
     n = index_books()
+    similar_index = SimilarityIndex.load()
+    if pipeline is not None:
+        pipeline._pitches.clear()
     return {"indexed": n}
 
+@app.get("/admin/stats")
+def admin_stats():
+    if pipeline is None:
+        raise HTTPException(status_code=500, detail="Pipeline not initialized")
+    return {"adaptive": pipeline.adaptive, **pipeline.stats}
+
 @app.post("/recommend")
 def recommend(payload: RecommendIn, request: Request):
     if pipeline is None:
@@ -83,6 +97,8 @@ def recommend(payload: RecommendIn, request: Request):
     result = pipeline.recommend(msg)
     if not result.get("title"):
         raise HTTPException(status_code=404, detail=result.get("reason", "No recommendation found"))
+    if payload.include_similar:
+        result["similar"] = similar_index.neighbors(result["title"]) or []
     return result
 
 @app.get("/summary")
@@ -92,6 +108,13 @@ def summary(title: str):
         raise HTTPException(status_code=404, detail="Title not found")
     return r
 
+@app.get("/similar")
+def similar(title: str, k: int | None = Query(None, ge=1)):
+    r = similar_index.neighbors(title, k)
+    if r is None:
+        raise HTTPException(status_code=404, detail="Title not found")
+    return {"title": title, "similar": r}
+
 @app.post("/tts")
 def tts(payload: TTSIn):
     if pipeline is None:
@@ -1,6 +1,15 @@
 from typing import List, Dict, Any, Optional
+import math
 from openai import OpenAI
-from .config import OPENAI_API_KEY, CHAT_MODEL, COLLECTION_NAME, TOP_K
+from .config import (
+    OPENAI_API_KEY,
+    CHAT_MODEL,
+    COLLECTION_NAME,
+    TOP_K,
+    ADAPTIVE_MODE,
+    ADAPTIVE_MAX_DISTANCE,
+    ADAPTIVE_MIN_MARGIN,
+)
 from .db import get_client, get_or_create_collection
 from .tools import get_summary_by_title
 from chromadb.api import ClientAPI
@@ -17,6 +26,12 @@ ASSISTANT_REC_PROMPT = (
     "and avoid spoilers."
 )
 
+BOOK_PITCH_PROMPT = (
+    "You are Smart Librarian. Write a brief, friendly pitch (2–3 sentences) for this book "
+    "that would suit any reader interested in its themes. Mention title and author once "
+    "and avoid spoilers."
+)
+
 def _find_by_title(cands, title):
     return next((c for c in cands if c.get("title") == title), {})
 
@@ -56,6 +71,22 @@ def _safe_parse_json(text: str, fallback_title: str, allowed_titles: set[str]) -
 
     return {"title": fallback_title, "reason": "Closest thematic match by retriever."}
 
+def _retrieval_confidence(cands: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Scores how decisive the retrieval was.
+    Decisive when the best candidate is close enough to the query and clearly
+    ahead of the runner-up (cosine distances, lower is better).
+    """
+    dists = sorted(c.get("distance", float("inf")) for c in cands)
+    top = dists[0] if dists else float("inf")
+    margin = (dists[1] - top) if len(dists) > 1 else float("inf")
+    decisive = top <= ADAPTIVE_MAX_DISTANCE and margin >= ADAPTIVE_MIN_MARGIN
+    return {
+        "top_distance": top if math.isfinite(top) else None,
+        "margin": margin if math.isfinite(margin) else None,
+        "decisive": decisive,
+    }
+
 def _as_list(x):
     if isinstance(x, list):
         return x
@@ -68,6 +99,17 @@ class RAGPipeline:
         self.chroma = client or get_client()
         self.collection = get_or_create_collection(self.chroma)
         self.llm = OpenAI(api_key=OPENAI_API_KEY)
+        self.adaptive = ADAPTIVE_MODE
+        self._pitches: Dict[str, str] = {}
+        self.stats = {
+            "requests": 0,
+            "llm_selection": 0,
+            "skipped_selection": 0,
+            "llm_unavailable": 0,
+            "pitch_cache_hits": 0,
+            "pitch_generated": 0,
+            "pitch_template": 0,
+        }
 
     def retrieve(self, query: str, k: int = TOP_K) -> List[Dict[str, Any]]:
         q = self.collection.query(
@@ -98,7 +140,51 @@ class RAGPipeline:
             )
         return "\n".join(lines)
 
+    def _book_pitch(self, title: str, author: str, short: str) -> str:
+        cached = self._pitches.get(title)
+        if cached:
+            self.stats["pitch_cache_hits"] += 1
+            return cached
+        try:
+            resp = self.llm.chat.completions.create(
+                model=CHAT_MODEL,
+                messages=[
+                    {"role": "system", "content": BOOK_PITCH_PROMPT},
+                    {"role": "user", "content":
+                        f"Title: {title}\nAuthor: {author}\nShort summary: {short}"
+                    },
+                ],
+                temperature=0.5,
+            )
+            pitch = (resp.choices[0].message.content or "").strip()
+        except Exception:
+            pitch = ""
+        if not pitch:
+            self.stats["pitch_template"] += 1
+            return f"I recommend '{title}' by {author}. {short}"
+        self.stats["pitch_generated"] += 1
+        self._pitches[title] = pitch
+        return pitch
+
+    def _decisive_recommendation(self, query: str, candidates: List[Dict[str, Any]],
+                                 confidence: Dict[str, Any]) -> Dict[str, Any]:
+        best = min(candidates, key=lambda x: x.get("distance", float("inf")))
+        title = best["title"]
+        detail = get_summary_by_title(title)
+        author = (detail or {}).get("author", "") or best.get("author", "")
+        return {
+            "query": query,
+            "title": title,
+            "reason": "Clear best match by retriever.",
+            "assistant_message": self._book_pitch(title, author, best.get("short_summary", "")),
+            "detailed_summary": (detail or {}).get("detailed_summary", ""),
+            "metadata": detail,
+            "candidates": candidates,
+            "confidence": confidence,
+        }
+
     def recommend(self, query: str) -> Dict[str, Any]:
+        self.stats["requests"] += 1
         candidates = self.retrieve(query)
 
         if not candidates:
@@ -108,8 +194,13 @@ class RAGPipeline:
                 "reason": "No candidates found. Reindex the dataset first.",
                 "candidates": []
             }
-            
 
+        confidence = _retrieval_confidence(candidates)
+        if self.adaptive and confidence["decisive"]:
+            self.stats["skipped_selection"] += 1
+            return self._decisive_recommendation(query, candidates, confidence)
+
+        self.stats["llm_selection"] += 1
         content = (
             f"User query: {query}\n\n"
             f"Candidates:\n{self._format_candidates(candidates)}\n\n"
@@ -127,6 +218,7 @@ class RAGPipeline:
             )
             text = resp.choices[0].message.content
         except Exception:
+            self.stats["llm_unavailable"] += 1
             best = min(candidates, key=lambda x: x.get("distance", float("inf")))
             detail = get_summary_by_title(best["title"])
             return {
@@ -136,6 +228,7 @@ class RAGPipeline:
                 "detailed_summary": (detail or {}).get("detailed_summary", ""),
                 "metadata": detail,
                 "candidates": candidates,
+                "confidence": confidence,
             }
 
         allowed = {c["title"] for c in candidates}
@@ -177,5 +270,6 @@ class RAGPipeline:
             "detailed_summary": (detail or {}).get("detailed_summary", ""),
             "metadata": detail,
             "candidates": candidates,
+            "confidence": confidence,
         }
 
@@ -0,0 +1,151 @@
+from typing import List, Dict, Any, Optional
+import hashlib
+import json
+import os
+import numpy as np
+from .config import SIMILAR_GRAPH, SIMILAR_K, SIMILAR_BATCH
+
+
+def load_similarity_graph(path=SIMILAR_GRAPH) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+def _save_similarity_graph(graph: Dict[str, Any], path=SIMILAR_GRAPH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(graph, f)
+    os.replace(tmp, path)
+
+def record_fingerprint(doc: str, meta: Dict[str, Any]) -> str:
+    """
+    Stable hash of what gets embedded and stored for a book. Embeddings are not
+    bit-for-bit repeatable across calls, so change detection keys on this instead.
+    """
+    blob = json.dumps(
+        {"doc": doc or "", "meta": {k: v for k, v in (meta or {}).items() if k != "fingerprint"}},
+        sort_keys=True,
+        default=str,
+    ).encode("utf-8")
+    return hashlib.sha1(blob).hexdigest()
+
+def _fetch_embeddings(coll, batch: int):
+    """
+    Pages through the collection and returns ids, metadatas, fingerprints and a
+    row-normalized embedding matrix (so dot product == cosine similarity).
+    """
+    ids, metas, fps, vecs = [], [], [], []
+    offset = 0
+    while True:
+        res = coll.get(include=["embeddings", "metadatas", "documents"], limit=batch, offset=offset)
+        got = res.get("ids") or []
+        if not got:
+            break
+        ids.extend(got)
+        for md, doc in zip(res["metadatas"], res["documents"]):
+            md = md or {}
+            metas.append(md)
+            fps.append(md.get("fingerprint") or record_fingerprint(doc, md))
+        vecs.extend(res["embeddings"])
+        offset += len(got)
+    if not ids:
+        return ids, metas, fps, np.zeros((0, 0), dtype=np.float32)
+    mat = np.asarray(vecs, dtype=np.float32)
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return ids, metas, fps, mat / norms
+
+def _top_k(sims: np.ndarray, k: int) -> np.ndarray:
+    k = min(k, sims.shape[1])
+    if k <= 0:
+        return np.zeros((sims.shape[0], 0), dtype=np.int64)
+    part = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(sims, part, axis=1), axis=1)
+    return np.take_along_axis(part, order, axis=1)
+
+def build_similarity_graph(coll, path=SIMILAR_GRAPH, k: int = SIMILAR_K,
+                           batch: int = SIMILAR_BATCH) -> Dict[str, int]:
+    """
+    Computes a k-nearest-neighbour graph over the stored book embeddings and
+    persists it next to the Chroma store.
+    Incremental: rows whose record fingerprint is unchanged keep their neighbours and
+    are only compared against new/changed books; rows that are new, changed
+    or pointed at a changed/removed book are recomputed in full.
+    """
+    ids, metas, fps, mat = _fetch_embeddings(coll, batch)
+
+    old = load_similarity_graph(path)
+    old_items = old.get("items", {}) if old.get("k") == k else {}
+    pos = {_id: n for n, _id in enumerate(ids)}
+    changed = [_id for _id, fp in zip(ids, fps) if old_items.get(_id, {}).get("fp") != fp]
+    dirty = set(changed) | (set(old_items) - set(ids))
+
+    neighbors: Dict[str, List] = {}
+    full = [
+        n for n, _id in enumerate(ids)
+        if _id in dirty or any(nb in dirty for nb, _ in old_items[_id]["neighbors"])
+    ]
+    for start in range(0, len(full), batch):
+        rows = full[start:start + batch]
+        sims = mat[rows] @ mat.T
+        sims[np.arange(len(rows)), rows] = -np.inf
+        for i, best in enumerate(_top_k(sims, k)):
+            neighbors[ids[rows[i]]] = [
+                [ids[c], round(float(sims[i, c]), 4)]
+                for c in best if np.isfinite(sims[i, c])
+            ]
+
+    rest = [n for n, _id in enumerate(ids) if _id not in neighbors]
+    c_idx = [pos[_id] for _id in changed]
+    for start in range(0, len(rest), batch):
+        rows = rest[start:start + batch]
+        sims = mat[rows] @ mat[c_idx].T if c_idx else None
+        for i, r in enumerate(rows):
+            merged = list(old_items[ids[r]]["neighbors"])
+            if sims is not None:
+                merged += [[ids[c], round(float(s), 4)] for c, s in zip(c_idx, sims[i])]
+            merged.sort(key=lambda x: x[1], reverse=True)
+            neighbors[ids[r]] = merged[:k]
+
+    items = {}
+    for _id, md, fp in zip(ids, metas, fps):
+        items[_id] = {
+            "title": md.get("title"),
+            "author": md.get("author"),
+            "fp": fp,
+            "neighbors": neighbors.get(_id, []),
+        }
+    _save_similarity_graph({"k": k, "items": items}, path)
+    return {"items": len(ids), "recomputed": len(full), "merged": len(rest) if c_idx else 0}
+
+class SimilarityIndex:
+    """
+    In-memory view of the persisted graph, keyed by title, so lookups are O(k)
+    and need no embedding or vector-store calls.
+    """
+    def __init__(self, graph: Optional[Dict[str, Any]] = None):
+        items = (graph or {}).get("items", {})
+        self._by_title: Dict[str, List[Dict[str, Any]]] = {}
+        for it in items.values():
+            self._by_title[it["title"]] = [
+                {
+                    "title": items[nb]["title"],
+                    "author": items[nb]["author"],
+                    "score": score,
+                }
+                for nb, score in it["neighbors"] if nb in items
+            ]
+
+    @classmethod
+    def load(cls, path=SIMILAR_GRAPH) -> "SimilarityIndex":
+        return cls(load_similarity_graph(path))
+
+    def neighbors(self, title: str, k: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
+        found = self._by_title.get(title)
+        if found is None:
+            return None
+        return found if k is None else found[:k]
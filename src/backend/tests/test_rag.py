@@ -1,5 +1,8 @@
+from types import SimpleNamespace
 from fastapi.testclient import TestClient
 from backend.main import app
+from backend import rag_pipeline
+from backend.rag_pipeline import RAGPipeline, _retrieval_confidence
 
 client = TestClient(app)
 
@@ -14,3 +17,87 @@ def test_recommend():
     body = r.json()
     assert "title" in body
     assert "candidates" in body
+
+def test_similar_unknown_title():
+    r = client.get("/similar", params={"title": "No Such Book"})
+    assert r.status_code == 404
+
+def test_confidence_decisive():
+    c = _retrieval_confidence([{"distance": 0.2}, {"distance": 0.4}, {"distance": 0.5}])
+    assert c["decisive"] is True
+    assert c["top_distance"] == 0.2
+    assert abs(c["margin"] - 0.2) < 1e-9
+
+def test_confidence_small_margin():
+    c = _retrieval_confidence([{"distance": 0.2}, {"distance": 0.22}])
+    assert c["decisive"] is False
+
+def test_confidence_top_over_limit():
+    c = _retrieval_confidence([{"distance": 0.9}, {"distance": 1.5}])
+    assert c["decisive"] is False
+
+def test_confidence_single_candidate():
+    c = _retrieval_confidence([{"distance": 0.1}])
+    assert c["margin"] is None
+    assert c["decisive"] is True
+
+def test_confidence_missing_distance():
+    c = _retrieval_confidence([{"distance": 0.1}, {"title": "no distance"}])
+    assert c["margin"] is None
+    assert c["decisive"] is True
+    c = _retrieval_confidence([{"title": "no distance"}, {"title": "also none"}])
+    assert c["decisive"] is False
+    assert c["top_distance"] is None
+    assert c["margin"] is None
+
+class _StubLLM:
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.calls.append(kwargs)
+        if self.fail:
+            raise RuntimeError("LLM down")
+        msg = SimpleNamespace(content="A lovely pitch.")
+        return SimpleNamespace(choices=[SimpleNamespace(message=msg)])
+
+def _stub_pipeline(monkeypatch, llm):
+    monkeypatch.setattr(rag_pipeline, "get_summary_by_title",
+                        lambda t: {"title": t, "author": "Author", "detailed_summary": "Long."})
+    p = RAGPipeline.__new__(RAGPipeline)
+    p.llm = llm
+    p.adaptive = True
+    p._pitches = {}
+    p.stats = {k: 0 for k in (
+        "requests", "llm_selection", "skipped_selection", "llm_unavailable",
+        "pitch_cache_hits", "pitch_generated", "pitch_template",
+    )}
+    p.retrieve = lambda q: [
+        {"title": "Dune", "author": "Author", "short_summary": "Sand.", "distance": 0.1},
+        {"title": "Emma", "author": "Other", "short_summary": "Tea.", "distance": 0.6},
+    ]
+    return p
+
+def test_skip_path_uses_cached_pitch(monkeypatch):
+    llm = _StubLLM()
+    p = _stub_pipeline(monkeypatch, llm)
+    first = p.recommend("desert planet")
+    second = p.recommend("desert politics")
+    assert first["title"] == second["title"] == "Dune"
+    assert first["assistant_message"] == second["assistant_message"] == "A lovely pitch."
+    assert p.stats["skipped_selection"] == 2
+    assert p.stats["llm_selection"] == 0
+    assert p.stats["pitch_generated"] == 1
+    assert p.stats["pitch_cache_hits"] == 1
+    assert len(llm.calls) == 1
+    assert llm.calls[0]["messages"][0]["content"] == rag_pipeline.BOOK_PITCH_PROMPT
+
+def test_skip_path_template_when_llm_fails(monkeypatch):
+    p = _stub_pipeline(monkeypatch, _StubLLM(fail=True))
+    r = p.recommend("desert planet")
+    assert r["assistant_message"] == "I recommend 'Dune' by Author. Sand."
+    assert p.stats["pitch_template"] == 1
+    assert p.stats["llm_selection"] == 0
+    assert "Dune" not in p._pitches
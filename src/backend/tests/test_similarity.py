@@ -0,0 +1,103 @@
+import numpy as np
+from fastapi.testclient import TestClient
+from backend import main
+from backend.similarity import SimilarityIndex, build_similarity_graph, load_similarity_graph
+
+class _FakeCollection:
+    def __init__(self, vectors):
+        self.rows = {}
+        for _id, vec in vectors.items():
+            self.put(_id, vec)
+
+    def put(self, _id, vec, version="v1"):
+        md = {"title": f"Book {_id}", "author": "Someone", "fingerprint": f"{_id}-{version}"}
+        self.rows[_id] = (list(vec), md)
+
+    def get(self, include=None, limit=None, offset=0):
+        ids = sorted(self.rows)[offset:offset + limit]
+        return {
+            "ids": ids,
+            "embeddings": [self.rows[i][0] for i in ids],
+            "metadatas": [self.rows[i][1] for i in ids],
+            "documents": ["" for _ in ids],
+        }
+
+def _neighbor_ids(graph, _id):
+    return [nb for nb, _ in graph["items"][_id]["neighbors"]]
+
+def test_single_book_has_no_neighbors(tmp_path):
+    coll = _FakeCollection({"a": [1.0, 0.0]})
+    build_similarity_graph(coll, path=tmp_path / "g.json", k=3, batch=2)
+    graph = load_similarity_graph(tmp_path / "g.json")
+    assert graph["items"]["a"]["neighbors"] == []
+
+def test_small_catalog_excludes_self(tmp_path):
+    coll = _FakeCollection({"a": [1.0, 0.0], "b": [1.0, 0.0], "c": [0.0, 1.0]})
+    build_similarity_graph(coll, path=tmp_path / "g.json", k=5, batch=2)
+    graph = load_similarity_graph(tmp_path / "g.json")
+    assert _neighbor_ids(graph, "a") == ["b", "c"]
+    assert _neighbor_ids(graph, "b") == ["a", "c"]
+    assert graph["items"]["a"]["neighbors"][0][1] == 1.0
+
+def test_incremental_rebuild_matches_full_rebuild(tmp_path):
+    rng = np.random.default_rng(0)
+    vecs = {f"{i:02d}": rng.normal(size=8) for i in range(12)}
+    vecs["05"] = vecs["00"] + rng.normal(scale=0.01, size=8)
+    coll = _FakeCollection(vecs)
+    inc_path = tmp_path / "inc.json"
+    build_similarity_graph(coll, path=inc_path, k=3, batch=4)
+    assert _neighbor_ids(load_similarity_graph(inc_path), "00")[0] == "05"
+
+    coll.put("03", vecs["01"] + rng.normal(scale=0.01, size=8), version="v2")
+    coll.put("12", rng.normal(size=8))
+    del coll.rows["05"]
+    stats = build_similarity_graph(coll, path=inc_path, k=3, batch=4)
+    assert stats["recomputed"] < stats["items"]
+    assert stats["merged"] > 0
+
+    full_path = tmp_path / "full.json"
+    build_similarity_graph(coll, path=full_path, k=3, batch=4)
+    inc = load_similarity_graph(inc_path)["items"]
+    full = load_similarity_graph(full_path)["items"]
+    assert set(inc) == set(full)
+    assert "05" not in inc
+    for _id in full:
+        assert [nb for nb, _ in inc[_id]["neighbors"]] == [nb for nb, _ in full[_id]["neighbors"]]
+        for (_, s1), (_, s2) in zip(inc[_id]["neighbors"], full[_id]["neighbors"]):
+            assert abs(s1 - s2) < 1e-3
+
+def test_unchanged_rebuild_recomputes_nothing(tmp_path):
+    coll = _FakeCollection({"a": [1.0, 0.0], "b": [0.5, 0.5], "c": [0.0, 1.0]})
+    build_similarity_graph(coll, path=tmp_path / "g.json", k=2, batch=2)
+    stats = build_similarity_graph(coll, path=tmp_path / "g.json", k=2, batch=2)
+    assert stats == {"items": 3, "recomputed": 0, "merged": 0}
+
+GRAPH = {
+    "k": 2,
+    "items": {
+        "0": {"title": "Dune", "author": "Herbert", "fp": "x", "neighbors": [["1", 0.9], ["2", 0.5]]},
+        "1": {"title": "Hyperion", "author": "Simmons", "fp": "y", "neighbors": [["0", 0.9]]},
+        "2": {"title": "Emma", "author": "Austen", "fp": "z", "neighbors": []},
+    },
+}
+
+def test_similar_endpoint(monkeypatch):
+    monkeypatch.setattr(main, "similar_index", SimilarityIndex(GRAPH))
+    client = TestClient(main.app)
+    r = client.get("/similar", params={"title": "Dune"})
+    assert r.status_code == 200
+    assert r.json() == {
+        "title": "Dune",
+        "similar": [
+            {"title": "Hyperion", "author": "Simmons", "score": 0.9},
+            {"title": "Emma", "author": "Austen", "score": 0.5},
+        ],
+    }
+    r = client.get("/similar", params={"title": "Dune", "k": 1})
+    assert [s["title"] for s in r.json()["similar"]] == ["Hyperion"]
+
+def test_similar_rejects_non_positive_k(monkeypatch):
+    monkeypatch.setattr(main, "similar_index", SimilarityIndex(GRAPH))
+    client = TestClient(main.app)
+    assert client.get("/similar", params={"title": "Dune", "k": 0}).status_code == 422
+    assert client.get("/similar", params={"title": "Dune", "k": -1}).status_code == 422
@@ -21,13 +21,18 @@ export async function reindex() {
   return jsonFetch("/admin/reindex", { method: "POST" });
 }
 
-export async function recommend(query) {
+export async function recommend(query, includeSimilar = true) {
   return jsonFetch("/recommend", {
     method: "POST",
-    body: JSON.stringify({ query })
+    body: JSON.stringify({ query, include_similar: includeSimilar })
   });
 }
 
+export async function similar(title, k = 5) {
+  const enc = encodeURIComponent(title);
+  return jsonFetch(`/similar?title=${enc}&k=${k}`);
+}
+
 export async function summaryByTitle(title) {
   const enc = encodeURIComponent(title);
   return jsonFetch(`/summary?title=${enc}`);
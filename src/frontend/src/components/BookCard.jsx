@@ -86,6 +86,20 @@ export default function BookCard({ result }) {
           <p style={{ whiteSpace: "pre-wrap", lineHeight: 1.5, color: "#111827" }}>
             {detailed_summary}
           </p>
+          {result.similar?.length > 0 && (
+            <>
+              <h3 style={{ margin: "10px 0 6px", fontSize: 18, color: "#111827" }}>
+                More like this
+              </h3>
+              <ul style={{ margin: 0, paddingLeft: 18, color: "#4b5563" }}>
+                {result.similar.map((s) => (
+                  <li key={s.title}>
+                    <strong>{s.title}</strong> — {s.author}
+                  </li>
+                ))}
+              </ul>
+            </>
+          )}
         </div>
 
         <div style={{ flex: "0 0 260px", maxWidth: 512, minWidth: 220 }}>